@@ -2,14 +2,290 @@
 
 from __future__ import annotations
 
+import functools
 import json
+import mmap
+import os
 import re
-import uuid
-from copy import deepcopy
+import time
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON document, using orjson when it is installed."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_pretty(obj: Any) -> bytes:
+    """Encode ``obj`` as indented UTF-8 JSON terminated by a newline."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _json_dumps_line(obj: Any) -> bytes:
+    """Encode ``obj`` as a single compact JSON Lines record."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _clone(obj: Any) -> Any:
+    """Deep-copy JSON-compatible data through a serialisation round-trip.
+
+    Both halves run in C, which is much faster than ``copy.deepcopy`` for the
+    plain dicts and lists the agent keeps in memory.
+    """
+
+    if orjson is not None:
+        return orjson.loads(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS))
+    return json.loads(json.dumps(obj))
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so that a crash never leaves it truncated.
+
+    The bytes go to a sibling ``.tmp`` file which is fsynced and then renamed
+    over ``path`` with ``os.replace``.
+    """
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+# os.writev is POSIX-only; update_logs falls back to a single os.write.
+_writev = getattr(os, "writev", None)
+
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+
+def _open_append(path: Path) -> int:
+    """Open ``path`` for appending and return the raw file descriptor.
+
+    With O_APPEND every ``os.write`` lands at the current end of the file, so
+    records appended by several agents never overwrite each other. Rewriting
+    or truncating a journal must go through ``_journal_lock``.
+    """
+
+    return os.open(path, _APPEND_FLAGS, 0o644)
+
+
+@contextmanager
+def _journal_lock(fd: int, *, exclusive: bool) -> Iterator[None]:
+    """Hold an advisory ``flock`` on a journal for the duration of the block.
+
+    Appends take the lock shared and compaction or repair take it exclusive,
+    so a journal is never truncated while another agent or process is adding
+    to it. Without ``fcntl`` (Windows) this is a no-op and several agents must
+    not share one memory directory.
+    """
+
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _repair_journal(path: Path) -> None:
+    """Drop an unterminated trailing record left in a journal by a crash.
+
+    Appends land right after the current end of file, so a fragment left
+    there would swallow the next record into one unreadable line; cutting
+    the file back to its last newline keeps later appends on their own line.
+    """
+
+    with path.open("r+b") as handle, _journal_lock(handle.fileno(), exclusive=True):
+        data = handle.read()
+        if data and not data.endswith(b"\n"):
+            handle.truncate(data.rfind(b"\n") + 1)
+
+
+def _read_journal(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a JSON Lines journal, skipping unreadable lines."""
+
+    for line in path.read_bytes().splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield _json_loads(line)
+        except ValueError:
+            # Only a hand-edited or otherwise corrupted line can get here:
+            # torn trailing writes are cut off by _repair_journal at load.
+            continue
+
+
+# Prompt parsing patterns, compiled once at import time.
+_ROUTE_RE = re.compile(
+    r"(?P<search>cherche|google|web)"
+    r"|(?P<learn>apprends que|tiens sache que)"
+    r"|(?P<preference>mon avis|j'aime|je n'aime pas)"
+    r"|(?P<forget>oublie)"
+)
+# What a route handler returns: (response lines, actions, updates performed).
+_RouteResult = Tuple[List[str], List[str], List[str]]
+# When a prompt contains keywords of several routes, the first one listed
+# here wins, whatever their position in the prompt.
+_ROUTE_PRIORITY = ("search", "learn", "preference", "forget")
+_QUERY_RE = re.compile(r"(?:cherche|google|web)\s+(.*)", re.IGNORECASE)
+_FACT_PREFIX_RE = re.compile(r"^(apprends que|tiens sache que)\s+", re.IGNORECASE)
+_FACT_BODY_RE = re.compile(r"(.+?)\s+est\s+(.+)", re.IGNORECASE)
+_LIKE_RE = re.compile(r"j'aime\s+(.+)", re.IGNORECASE)
+_DISLIKE_RE = re.compile(r"je n'aime pas\s+(.+)", re.IGNORECASE)
+_QUESTION_RES = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"qui est\s+(.+)",
+        r"qu'est-ce que\s+(.+)",
+        r"quel est\s+(.+)",
+    )
+)
+_KEYWORD_RES = {
+    keyword: re.compile(re.escape(keyword), re.IGNORECASE) for keyword in ("oublie", "mon avis")
+}
+
+
+# Length of the character n-grams used by the in-memory fact index.
+_GRAM_SIZE = 3
+
+
+def _grams(text: str) -> Set[str]:
+    """Return the set of character n-grams of ``text``."""
+
+    return {text[i : i + _GRAM_SIZE] for i in range(len(text) - _GRAM_SIZE + 1)}
+
+
+def _route_prompt(lowered: str) -> Optional[str]:
+    """Return the action route for a lower-cased prompt in a single regex pass."""
+
+    found = set()
+    for match in _ROUTE_RE.finditer(lowered):
+        if match.lastgroup == _ROUTE_PRIORITY[0]:
+            return match.lastgroup
+        found.add(match.lastgroup)
+    for route in _ROUTE_PRIORITY:
+        if route in found:
+            return route
+    return None
+
+
+# The prompt parsers below are pure functions of their arguments, so repeated
+# prompts (REPL retries, scripted sessions) are answered from an LRU cache.
+# They return immutable values; the agent methods build fresh dicts from them.
+_PARSE_CACHE_SIZE = 2048
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _extract_query_impl(prompt: str) -> str:
+    match = _QUERY_RE.search(prompt)
+    if match:
+        return match.group(1).strip()
+    return prompt.strip()
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_fact_statement_impl(prompt: str) -> Optional[Tuple[str, str]]:
+    cleaned = _FACT_PREFIX_RE.sub("", prompt).strip()
+    match = _FACT_BODY_RE.search(cleaned)
+    if match:
+        return match.group(1).strip(), match.group(2).strip(" .")
+    stripped = cleaned.strip()
+    if stripped:
+        return stripped, stripped
+    return None
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_preference_statement_impl(prompt: str) -> Optional[Tuple[str, str, str]]:
+    opinion_match = _KEYWORD_RES["mon avis"].search(prompt)
+    if opinion_match:
+        after = prompt[opinion_match.end() :].strip(" :")
+        if after:
+            return "general", after, after
+        return None
+    like_match = _LIKE_RE.search(prompt)
+    if like_match:
+        return "likes", like_match.group(1).strip(" ."), "like"
+    dislike_match = _DISLIKE_RE.search(prompt)
+    if dislike_match:
+        return "dislikes", dislike_match.group(1).strip(" ."), "dislike"
+    return None
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _extract_question_subject_impl(prompt: str) -> Optional[str]:
+    lowered = prompt.lower().strip(" ?!.")
+    for pattern in _QUESTION_RES:
+        match = pattern.search(lowered)
+        if match:
+            return match.group(1).strip()
+    if lowered.endswith("?"):
+        lowered = lowered[:-1]
+    return lowered if lowered else None
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _extract_after_keyword_impl(prompt: str, keyword: str) -> str:
+    pattern = _KEYWORD_RES.get(keyword)
+    if pattern is None:
+        pattern = re.compile(re.escape(keyword), flags=re.IGNORECASE)
+    match = pattern.search(prompt)
+    if not match:
+        return ""
+    return prompt[match.end() :]
+
+
+class _Descriptors:
+    """Raw file descriptors owned by one agent, closed together.
+
+    Kept apart from the agent so that a ``weakref.finalize`` callback can
+    close them without holding a reference to the agent itself.
+    """
+
+    __slots__ = ("facts_log", "preferences_log", "logs")
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    def close(self) -> None:
+        for name in self.__slots__:
+            fd = getattr(self, name)
+            if fd is not None:
+                setattr(self, name, None)
+                os.close(fd)
 
 
 @dataclass(frozen=True)
@@ -26,10 +302,18 @@ class MemoryPaths:
     def facts(self) -> Path:
         return self.root / "memory" / "facts.json"
 
+    @property
+    def facts_log(self) -> Path:
+        return self.root / "memory" / "facts.jsonl"
+
     @property
     def preferences(self) -> Path:
         return self.root / "memory" / "preferences.json"
 
+    @property
+    def preferences_log(self) -> Path:
+        return self.root / "memory" / "preferences.jsonl"
+
     @property
     def logs(self) -> Path:
         return self.root / "memory" / "logs.jsonl"
@@ -38,10 +322,56 @@ class MemoryPaths:
 class AxonAgent:
     """AXON agent able to load, store, and reason over local knowledge bases."""
 
+    # Default confidence of a fact by provenance; other sources get 0.5.
+    _CONFIDENCE_MAP = MappingProxyType({"user": 0.2, "web": 0.8})
+
+    # A journal is folded back into its JSON snapshot once it holds more
+    # records than this fraction of the stored facts or preferences (and at
+    # least the minimum below), which keeps compaction cost amortised O(1)
+    # per write.
+    _COMPACT_RATIO = 0.5
+    _COMPACT_MIN_RECORDS = 64
+
+    # logs.jsonl is soft-capped: once it exceeds _LOG_MAX_BYTES the oldest
+    # lines are dropped until it fits in _LOG_SOFT_RATIO of the cap, so a
+    # trim is always followed by many appends before the next one.
+    _LOG_MAX_BYTES = 8 * 1024 * 1024
+    _LOG_SOFT_RATIO = 0.8
+
+    # Handler method name for each route returned by _route_prompt(). Names
+    # rather than bound methods so the agent holds no reference to itself.
+    _HANDLERS: Dict[Optional[str], str] = {
+        "search": "_do_search",
+        "learn": "_do_learn",
+        "preference": "_do_preference",
+        "forget": "_do_forget",
+        None: "_do_answer",
+    }
+
+    # (unix second, formatted date and time up to that second) used by _now().
+    _now_cache: Tuple[int, str] = (-1, "")
+
     def __init__(self) -> None:
         self.paths = MemoryPaths()
         self.memory: Dict[str, Any] = {}
         self.axioms: str = ""
+        self._axioms_mtime_ns: Optional[int] = None
+        self._preferences_log_records = 0
+        self._fds = _Descriptors()
+        self._fds_finalizer: Optional[weakref.finalize] = None
+        self._facts_log_records = 0
+        self._facts_cols: Dict[str, Any] = {}
+        self._fact_rows: Dict[Any, int] = {}
+        self._gram_index: Dict[str, Set[int]] = {}
+        self._prefix_index: Dict[str, Set[int]] = {}
+        self._short_subject_rows: Set[int] = set()
+        self._live_fact_count = 0
+        self._log_bytes = 0
+        # Reused by respond() for every log entry; update_logs serialises it
+        # immediately and keeps no reference to it.
+        self._log_scratch: Dict[str, Any] = dict.fromkeys(
+            ("timestamp", "prompt", "response", "actions", "updates")
+        )
         self.ensure_storage()
         self.load_memory()
         self.load_axioms()
@@ -50,56 +380,213 @@ class AxonAgent:
     # File management helpers
     # ---------------------------------------------------------------------
     def ensure_storage(self) -> None:
-        """Ensure required directories and files exist before use."""
+        """Ensure required directories and files exist before use.
+
+        The append-only journal and log files are opened here once and their
+        descriptors are kept until ``close()`` is called or the agent is
+        garbage-collected.
+        """
 
         self.paths.root.mkdir(parents=True, exist_ok=True)
         (self.paths.root / "config").mkdir(exist_ok=True)
         (self.paths.root / "memory").mkdir(exist_ok=True)
 
         if not self.paths.facts.exists():
-            self.paths.facts.write_text(json.dumps({"items": []}, indent=2), encoding="utf-8")
+            self.paths.facts.write_bytes(_json_dumps_pretty({"items": []}))
         if not self.paths.preferences.exists():
-            self.paths.preferences.write_text(json.dumps({}, indent=2), encoding="utf-8")
-        if not self.paths.logs.exists():
-            self.paths.logs.touch()
+            self.paths.preferences.write_bytes(_json_dumps_pretty({}))
         if not self.paths.config.exists():
             self.paths.config.write_text("", encoding="utf-8")
 
+        if self._fds_finalizer is None or not self._fds_finalizer.alive:
+            # Also re-armed when a writer reopens descriptors after close().
+            self._fds_finalizer = weakref.finalize(self, self._fds.close)
+        if self._fds.facts_log is None:
+            self._fds.facts_log = _open_append(self.paths.facts_log)
+        if self._fds.preferences_log is None:
+            self._fds.preferences_log = _open_append(self.paths.preferences_log)
+        if self._fds.logs is None:
+            self._fds.logs = _open_append(self.paths.logs)
+            self._log_bytes = os.fstat(self._fds.logs).st_size
+
     def load_axioms(self) -> None:
-        """Load the axioms file described by the specification."""
+        """Load the axioms file described by the specification.
 
-        if self.paths.config.exists():
-            self.axioms = self.paths.config.read_text(encoding="utf-8")
-        else:
+        The file is only read again when its modification time changed since
+        the previous load.
+        """
+
+        try:
+            mtime_ns = os.stat(self.paths.config).st_mtime_ns
+            if mtime_ns != self._axioms_mtime_ns:
+                self.axioms = self.paths.config.read_text(encoding="utf-8")
+                self._axioms_mtime_ns = mtime_ns
+        except FileNotFoundError:
             self.axioms = ""
+            self._axioms_mtime_ns = None
 
     def load_memory(self) -> Dict[str, Any]:
-        """Load memory JSON files and keep them in-memory."""
+        """Load memory JSON files and keep them in-memory.
 
-        with self.paths.facts.open("r", encoding="utf-8") as handle:
-            facts = json.load(handle)
-        with self.paths.preferences.open("r", encoding="utf-8") as handle:
-            preferences = json.load(handle)
+        Facts and preferences are read from their ``.json`` snapshots, then
+        the records appended to the matching ``.jsonl`` journals since the
+        last compaction are replayed on top of them. A record torn by a crash
+        at the end of a journal is discarded before anything else is appended.
+        """
+
+        _repair_journal(self.paths.facts_log)
+        _repair_journal(self.paths.preferences_log)
+        facts = _json_loads(self.paths.facts.read_bytes())
+        preferences = _json_loads(self.paths.preferences.read_bytes())
 
         self.memory = {
             "facts": facts,
             "preferences": preferences,
         }
-        return deepcopy(self.memory)
+        self._preferences_log_records = self._replay_preferences_log()
+        self._build_fact_columns()
+        self._facts_log_records = self._replay_facts_log()
+        return _clone(self.memory)
 
     def save_memory(self) -> None:
         """Persist the current in-memory state back to disk."""
 
-        facts = self.memory.get("facts", {"items": []})
-        preferences = self.memory.get("preferences", {})
-        self.paths.facts.write_text(
-            json.dumps(facts, indent=2, ensure_ascii=False) + "\n",
-            encoding="utf-8",
-        )
-        self.paths.preferences.write_text(
-            json.dumps(preferences, indent=2, ensure_ascii=False) + "\n",
-            encoding="utf-8",
-        )
+        self._compact_facts()
+        self._compact_preferences()
+
+    def close(self) -> None:
+        """Release the file descriptors kept open by the agent."""
+
+        if self._fds_finalizer is not None:
+            self._fds_finalizer()
+
+    def __enter__(self) -> "AxonAgent":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _replay_facts_log(self) -> int:
+        """Apply the facts journal to the loaded facts and return its record count."""
+
+        records = 0
+        for record in _read_journal(self.paths.facts_log):
+            records += 1
+            self._apply_fact_record(record)
+        return records
+
+    def _apply_fact_record(self, record: Dict[str, Any]) -> None:
+        """Apply one facts journal record; replaying a record twice is harmless."""
+
+        if record.get("op") == "put":
+            self._merge_fact(record["fact"])
+        elif record.get("op") == "del":
+            row = self._fact_rows.get(record.get("id"))
+            if row is not None:
+                self._mark_fact_deleted(row, record.get("deleted_at"))
+
+    def _merge_fact(self, fact: Dict[str, Any]) -> None:
+        """Add a fact read from disk, or carry over its deletion if already known."""
+
+        row = self._fact_rows.get(fact.get("id"))
+        if row is None:
+            self.memory["facts"]["items"].append(fact)
+            self._add_fact_row(fact)
+        elif fact.get("deleted"):
+            self._mark_fact_deleted(row, fact.get("deleted_at"))
+
+    def _append_facts_log(self, records: List[Dict[str, Any]]) -> None:
+        """Append journal records with a single write on the O_APPEND descriptor."""
+
+        if self._fds.facts_log is None:
+            self.ensure_storage()
+        with _journal_lock(self._fds.facts_log, exclusive=False):
+            os.write(self._fds.facts_log, b"".join(_json_dumps_line(record) for record in records))
+        self._facts_log_records += len(records)
+        stored = len(self.memory.get("facts", {}).get("items", []))
+        if self._journal_needs_compaction(self._facts_log_records, stored):
+            self._compact_facts()
+
+    def _replay_preferences_log(self) -> int:
+        """Apply the preferences journal to the loaded preferences and return its record count."""
+
+        records = 0
+        for record in _read_journal(self.paths.preferences_log):
+            records += 1
+            self._apply_preference_record(record)
+        return records
+
+    def _apply_preference_record(self, record: Dict[str, Any]) -> None:
+        """Apply one preferences journal record."""
+
+        entry = {"opinion": record.get("opinion"), "added_at": record.get("added_at")}
+        self._merge_preference(record["category"], record["item"], entry)
+
+    def _merge_preference(self, category: str, item: str, entry: Dict[str, Any]) -> None:
+        """Store a preference read from disk unless memory holds a newer one."""
+
+        block = self.memory["preferences"].setdefault(category, {})
+        current = block.get(item)
+        if current is None or (entry.get("added_at") or "") >= (current.get("added_at") or ""):
+            block[item] = entry
+
+    def _append_preferences_log(self, record: Dict[str, Any]) -> None:
+        """Append one preference record, compacting once the journal is too long."""
+
+        if self._fds.preferences_log is None:
+            self.ensure_storage()
+        with _journal_lock(self._fds.preferences_log, exclusive=False):
+            os.write(self._fds.preferences_log, _json_dumps_line(record))
+        self._preferences_log_records += 1
+        stored = sum(len(block) for block in self.memory.get("preferences", {}).values())
+        if self._journal_needs_compaction(self._preferences_log_records, stored):
+            self._compact_preferences()
+
+    def _journal_needs_compaction(self, records: int, stored: int) -> bool:
+        """Tell whether a journal of ``records`` lines over ``stored`` entries is due."""
+
+        return records > max(self._COMPACT_MIN_RECORDS, self._COMPACT_RATIO * stored)
+
+    def _compact_facts(self) -> None:
+        """Rewrite facts.json from memory and truncate the journal.
+
+        Other agents may share the memory directory, so under the exclusive
+        journal lock the facts they added to the snapshot or the journal since
+        this agent loaded are merged in first and survive the rewrite.
+        """
+
+        if self._fds.facts_log is None:
+            self.ensure_storage()
+        with _journal_lock(self._fds.facts_log, exclusive=True):
+            for fact in _json_loads(self.paths.facts.read_bytes()).get("items", []):
+                self._merge_fact(fact)
+            for record in _read_journal(self.paths.facts_log):
+                self._apply_fact_record(record)
+            facts = self.memory.get("facts", {"items": []})
+            _atomic_write_bytes(self.paths.facts, _json_dumps_pretty(facts))
+            os.ftruncate(self._fds.facts_log, 0)
+        self._facts_log_records = 0
+
+    def _compact_preferences(self) -> None:
+        """Rewrite preferences.json from memory and truncate the journal.
+
+        As for facts, preferences written by other agents since this one
+        loaded are merged in under the exclusive journal lock first; the most
+        recent ``added_at`` wins for each (category, item).
+        """
+
+        if self._fds.preferences_log is None:
+            self.ensure_storage()
+        with _journal_lock(self._fds.preferences_log, exclusive=True):
+            for category, block in _json_loads(self.paths.preferences.read_bytes()).items():
+                for item, entry in block.items():
+                    self._merge_preference(category, item, entry)
+            for record in _read_journal(self.paths.preferences_log):
+                self._apply_preference_record(record)
+            preferences = self.memory.get("preferences", {})
+            _atomic_write_bytes(self.paths.preferences, _json_dumps_pretty(preferences))
+            os.ftruncate(self._fds.preferences_log, 0)
+        self._preferences_log_records = 0
 
     # ---------------------------------------------------------------------
     # Memory manipulation
@@ -117,13 +604,12 @@ class AxonAgent:
     ) -> Dict[str, Any]:
         """Store a factual statement with provenance and metadata."""
 
-        confidence_map = {"user": 0.2, "web": 0.8}
         fact = {
-            "id": uuid.uuid4().hex,
+            "id": os.urandom(16).hex(),
             "subject": subject.strip(),
             "value": value.strip(),
             "provenance": provenance,
-            "confidence": confidence if confidence is not None else confidence_map.get(provenance, 0.5),
+            "confidence": confidence if confidence is not None else self._CONFIDENCE_MAP.get(provenance, 0.5),
             "added_at": self._now(),
             "notes": notes,
             "tags": tags or [],
@@ -133,6 +619,8 @@ class AxonAgent:
 
         self.memory.setdefault("facts", {"items": []})
         self.memory["facts"].setdefault("items", []).append(fact)
+        self._add_fact_row(fact)
+        self._append_facts_log([{"op": "put", "fact": fact}])
         return fact
 
     def remember_preference(self, category: str, item: str, opinion: str) -> Dict[str, Any]:
@@ -144,23 +632,135 @@ class AxonAgent:
             "opinion": opinion,
             "added_at": self._now(),
         }
+        self._append_preferences_log(
+            {"category": category, "item": item, **category_block[item]}
+        )
         return category_block[item]
 
     def forget_fact(self, subject_query: str) -> int:
         """Soft-delete facts matching the provided subject query."""
 
-        if not subject_query.strip():
+        query = subject_query.lower()
+        if not query.strip() or not self._live_fact_count:
             return 0
-        deleted = 0
-        for fact in self.memory.get("facts", {}).get("items", []):
-            if fact.get("deleted"):
+        cols = self._facts_cols
+        subjects, deleted_col = cols["subject_lc"], cols["deleted"]
+        candidates = self._containing_rows(query)
+        if candidates is None:
+            rows: Iterable[int] = range(len(subjects))
+        elif not candidates:
+            return 0
+        else:
+            rows = sorted(candidates)
+        now = self._now()
+        records: List[Dict[str, Any]] = []
+        for row in rows:
+            if deleted_col[row] or query not in subjects[row]:
                 continue
-            subject = fact.get("subject", "").lower()
-            if subject_query.lower() in subject:
-                fact["deleted"] = True
-                fact["deleted_at"] = self._now()
-                deleted += 1
-        return deleted
+            self._mark_fact_deleted(row, now)
+            records.append({"op": "del", "id": cols["ref"][row].get("id"), "deleted_at": now})
+        if records:
+            self._append_facts_log(records)
+        return len(records)
+
+    def _build_fact_columns(self) -> None:
+        """Rebuild the column view of the facts from ``self.memory``.
+
+        Facts are kept as dicts for storage and presentation, but matching
+        scans parallel columns of pre-lowered subjects and values plus a
+        deleted flag per row; row ``i`` always refers to ``items[i]``.
+        """
+
+        self.memory.setdefault("facts", {}).setdefault("items", [])
+        self._facts_cols = {"subject_lc": [], "value_lc": [], "deleted": bytearray(), "ref": []}
+        self._fact_rows = {}
+        self._gram_index = {}
+        self._prefix_index = {}
+        self._short_subject_rows = set()
+        self._live_fact_count = 0
+        for fact in self.memory.get("facts", {}).get("items", []):
+            self._add_fact_row(fact)
+
+    def _add_fact_row(self, fact: Dict[str, Any]) -> None:
+        cols = self._facts_cols
+        row = len(cols["ref"])
+        cols["subject_lc"].append(fact.get("subject", "").lower())
+        cols["value_lc"].append(fact.get("value", "").lower())
+        cols["deleted"].append(1 if fact.get("deleted") else 0)
+        cols["ref"].append(fact)
+        self._fact_rows[fact.get("id")] = row
+        if not fact.get("deleted"):
+            self._live_fact_count += 1
+            self._index_row(row)
+
+    def _mark_fact_deleted(self, row: int, deleted_at: Optional[str]) -> None:
+        """Soft-delete the fact at ``row`` unless it is already deleted."""
+
+        deleted_col = self._facts_cols["deleted"]
+        if deleted_col[row]:
+            return
+        deleted_col[row] = 1
+        self._unindex_row(row)
+        self._live_fact_count -= 1
+        fact = self._facts_cols["ref"][row]
+        fact["deleted"] = True
+        fact["deleted_at"] = deleted_at
+
+    def _index_row(self, row: int) -> None:
+        """Register a live fact row in the n-gram indexes.
+
+        ``_gram_index`` maps every n-gram of the subject and value to its rows,
+        so a query contained in either must hit the row under all of its own
+        n-grams. ``_prefix_index`` maps the first n-gram of each subject, so a
+        subject contained in a query is found under one of the query's
+        n-grams; subjects shorter than an n-gram are tracked separately.
+        """
+
+        subject = self._facts_cols["subject_lc"][row]
+        value = self._facts_cols["value_lc"][row]
+        for gram in _grams(subject) | _grams(value):
+            self._gram_index.setdefault(gram, set()).add(row)
+        if len(subject) < _GRAM_SIZE:
+            self._short_subject_rows.add(row)
+        else:
+            self._prefix_index.setdefault(subject[:_GRAM_SIZE], set()).add(row)
+
+    def _unindex_row(self, row: int) -> None:
+        subject = self._facts_cols["subject_lc"][row]
+        value = self._facts_cols["value_lc"][row]
+        for gram in _grams(subject) | _grams(value):
+            self._gram_index.get(gram, set()).discard(row)
+        self._short_subject_rows.discard(row)
+        self._prefix_index.get(subject[:_GRAM_SIZE], set()).discard(row)
+
+    def _containing_rows(self, query: str) -> Optional[Set[int]]:
+        """Return the live rows whose subject or value may contain ``query``.
+
+        ``query`` must already be lower-cased. Returns None when it is shorter
+        than an n-gram and the caller has to scan every row.
+        """
+
+        grams = _grams(query)
+        if not grams:
+            return None
+        postings = sorted((self._gram_index.get(gram, set()) for gram in grams), key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def _candidate_rows(self, query: str) -> Optional[List[int]]:
+        """Return the sorted rows that may match ``query``, or None to scan all.
+
+        ``query`` must already be lower-cased. Candidates still need to be
+        checked against the actual matching rule.
+        """
+
+        candidates = self._containing_rows(query)
+        if candidates is None:
+            return None
+        candidates |= self._short_subject_rows
+        grams = _grams(query)
+        for gram in grams:
+            candidates |= self._prefix_index.get(gram, set())
+        return sorted(candidates)
 
     # ---------------------------------------------------------------------
     # Interaction helpers
@@ -189,113 +789,133 @@ class AxonAgent:
         """Process a user prompt according to the AXON specification."""
 
         self.load_axioms()
-        self.load_memory()
 
-        lowered = prompt.lower().strip()
-        actions: List[str] = []
-        response_lines: List[str] = []
-        updates_performed: List[str] = []
+        route = _route_prompt(prompt.lower())
+        response_lines, actions, updates_performed = getattr(self, self._HANDLERS[route])(prompt)
+
+        entry = self._log_scratch
+        entry["timestamp"] = self._now()
+        entry["prompt"] = prompt
+        entry["response"] = response_lines
+        entry["actions"] = actions
+        entry["updates"] = updates_performed
+        try:
+            self.update_logs(entry)
+        finally:
+            for key in entry:
+                entry[key] = None
 
-        if any(keyword in lowered for keyword in ("cherche", "google", "web")):
-            query = self._extract_query(prompt)
-            results = self.search_web(query)
-            for result in results:
-                stored = self.remember_fact(
-                    subject=result["subject"],
-                    value=result["summary"],
-                    provenance=result.get("provenance", "web"),
-                    confidence=result.get("confidence"),
-                    metadata={"url": result.get("url"), "query": query},
-                )
-                updates_performed.append(f"fact:{stored['id']}")
-            response_lines.append(f"Résultat de recherche (mock) pour '{query}'.")
-            actions.append("search_web")
-
-        elif any(keyword in lowered for keyword in ("apprends que", "tiens sache que")):
-            fact_data = self._parse_fact_statement(prompt)
-            if fact_data:
-                stored = self.remember_fact(
-                    subject=fact_data["subject"],
-                    value=fact_data["value"],
-                    provenance="user",
-                )
-                response_lines.append(
-                    f"Je mémorise que {stored['subject']} est {stored['value']} (provenance utilisateur)."
-                )
-                updates_performed.append(f"fact:{stored['id']}")
-            else:
-                response_lines.append("Je n'ai pas réussi à comprendre le fait à mémoriser.")
-            actions.append("remember_fact")
-
-        elif any(keyword in lowered for keyword in ("mon avis", "j'aime", "je n'aime pas")):
-            preference = self._parse_preference_statement(prompt)
-            if preference:
-                stored = self.remember_preference(
-                    preference["category"], preference["item"], preference["opinion"],
-                )
-                response_lines.append(
-                    f"Préférence enregistrée pour {preference['item']} dans {preference['category']}."
-                )
-                updates_performed.append(f"preference:{preference['category']}:{preference['item']}")
-            else:
-                response_lines.append("Je n'ai pas compris la préférence à enregistrer.")
-            actions.append("remember_preference")
-
-        elif "oublie" in lowered:
-            subject_query = self._extract_after_keyword(prompt, "oublie").strip()
-            if not subject_query:
-                response_lines.append("Précise ce que je dois oublier.")
-                deleted = 0
-            else:
-                deleted = self.forget_fact(subject_query)
-                if deleted:
-                    response_lines.append(
-                        f"{deleted} fait(s) marqué(s) comme oublié(s) pour '{subject_query}'."
-                    )
-                else:
-                    response_lines.append("Aucun fait correspondant à oublier.")
-            actions.append("forget_fact")
+        return "\n".join(response_lines)
 
-        else:
-            subject_query = self._extract_question_subject(prompt)
-            if subject_query:
-                matches = self._find_matching_facts(subject_query)
-                if matches:
-                    for fact in matches:
-                        source = fact.get("provenance", "inconnue")
-                        added_at = fact.get("added_at", "?")
-                        response_lines.append(
-                            f"Selon {source}: {fact['subject']} = {fact['value']} [{added_at}]."
-                        )
-                else:
-                    response_lines.append("Je n'ai aucun fait correspondant en mémoire.")
-            else:
-                response_lines.append("Je suis prêt à apprendre ou à répondre selon les instructions.")
-            actions.append("answer")
-
-        self.save_memory()
-        self.update_logs(
-            {
-                "timestamp": self._now(),
-                "prompt": prompt,
-                "response": response_lines,
-                "actions": actions,
-                "updates": updates_performed,
-            }
+    # ------------------------------------------------------------------
+    # Route handlers, each returning (response lines, actions, updates)
+    # ------------------------------------------------------------------
+    def _do_search(self, prompt: str) -> _RouteResult:
+        query = self._extract_query(prompt)
+        updates_performed: List[str] = []
+        for result in self.search_web(query):
+            stored = self.remember_fact(
+                subject=result["subject"],
+                value=result["summary"],
+                provenance=result.get("provenance", "web"),
+                confidence=result.get("confidence"),
+                metadata={"url": result.get("url"), "query": query},
+            )
+            updates_performed.append(f"fact:{stored['id']}")
+        return [f"Résultat de recherche (mock) pour '{query}'."], ["search_web"], updates_performed
+
+    def _do_learn(self, prompt: str) -> _RouteResult:
+        fact_data = self._parse_fact_statement(prompt)
+        if not fact_data:
+            return ["Je n'ai pas réussi à comprendre le fait à mémoriser."], ["remember_fact"], []
+        stored = self.remember_fact(
+            subject=fact_data["subject"],
+            value=fact_data["value"],
+            provenance="user",
+        )
+        return (
+            [f"Je mémorise que {stored['subject']} est {stored['value']} (provenance utilisateur)."],
+            ["remember_fact"],
+            [f"fact:{stored['id']}"],
         )
 
-        return "\n".join(response_lines)
+    def _do_preference(self, prompt: str) -> _RouteResult:
+        preference = self._parse_preference_statement(prompt)
+        if not preference:
+            return ["Je n'ai pas compris la préférence à enregistrer."], ["remember_preference"], []
+        self.remember_preference(preference["category"], preference["item"], preference["opinion"])
+        return (
+            [f"Préférence enregistrée pour {preference['item']} dans {preference['category']}."],
+            ["remember_preference"],
+            [f"preference:{preference['category']}:{preference['item']}"],
+        )
+
+    def _do_forget(self, prompt: str) -> _RouteResult:
+        subject_query = self._extract_after_keyword(prompt, "oublie").strip()
+        if not subject_query:
+            return ["Précise ce que je dois oublier."], ["forget_fact"], []
+        deleted = self.forget_fact(subject_query)
+        if deleted:
+            line = f"{deleted} fait(s) marqué(s) comme oublié(s) pour '{subject_query}'."
+        else:
+            line = "Aucun fait correspondant à oublier."
+        return [line], ["forget_fact"], []
+
+    def _do_answer(self, prompt: str) -> _RouteResult:
+        subject_query = self._extract_question_subject(prompt)
+        if not subject_query:
+            return ["Je suis prêt à apprendre ou à répondre selon les instructions."], ["answer"], []
+        matches = self._find_matching_facts(subject_query)
+        if not matches:
+            return ["Je n'ai aucun fait correspondant en mémoire."], ["answer"], []
+        response_lines = []
+        for fact in matches:
+            source = fact.get("provenance", "inconnue")
+            added_at = fact.get("added_at", "?")
+            response_lines.append(f"Selon {source}: {fact['subject']} = {fact['value']} [{added_at}].")
+        return response_lines, ["answer"], []
 
     def update_logs(self, entry: Dict[str, Any]) -> None:
-        """Append a JSON line to the logs file."""
+        """Append a JSON line to the logs file, trimming it past the size cap."""
+
+        if self._fds.logs is None:
+            self.ensure_storage()
+        if orjson is not None and _writev is not None:
+            # orjson already yields bytes; gathering the newline with writev
+            # avoids copying the payload just to terminate the line.
+            payload = orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS)
+            written = _writev(self._fds.logs, (payload, b"\n"))
+        else:
+            written = os.write(self._fds.logs, _json_dumps_line(entry))
+        self._log_bytes += written
+        if self._log_bytes > self._LOG_MAX_BYTES:
+            self._trim_log(written)
 
-        with self.paths.logs.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    def _trim_log(self, newest_size: int) -> None:
+        """Drop the oldest log lines so the file fits in the soft target.
+
+        The newest entry is always kept, even when it alone exceeds the target.
+        """
+
+        target = max(int(self._LOG_MAX_BYTES * self._LOG_SOFT_RATIO), newest_size)
+        if self._fds.logs is not None:
+            fd, self._fds.logs = self._fds.logs, None
+            os.close(fd)
+        with self.paths.logs.open("rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            if size <= target:
+                self._log_bytes = size
+                return
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                start = view.find(b"\n", size - target - 1) + 1
+                tail = view[start:]
+        _atomic_write_bytes(self.paths.logs, tail)
+        self._log_bytes = len(tail)
 
     def show_memory(self) -> Dict[str, Any]:
         """Return a deep copy of the current memory state (for debugging)."""
 
-        return deepcopy(self.memory)
+        return _clone(self.memory)
 
     # ------------------------------------------------------------------
     # Parsing helpers
@@ -303,90 +923,66 @@ class AxonAgent:
     def _extract_query(self, prompt: str) -> str:
         """Extract a search query from the prompt."""
 
-        match = re.search(r"(?:cherche|google|web)\s+(.*)", prompt, flags=re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return prompt.strip()
+        return _extract_query_impl(prompt)
 
     def _parse_fact_statement(self, prompt: str) -> Optional[Dict[str, str]]:
         """Attempt to parse a fact statement from the user."""
 
-        prefix_pattern = re.compile(r"^(apprends que|tiens sache que)\s+", flags=re.IGNORECASE)
-        cleaned = prefix_pattern.sub("", prompt).strip()
-        match = re.search(r"(.+?)\s+est\s+(.+)", cleaned, flags=re.IGNORECASE)
-        if match:
-            subject = match.group(1).strip()
-            value = match.group(2).strip(" .")
-            return {"subject": subject, "value": value}
-        stripped = cleaned.strip()
-        if stripped:
-            return {"subject": stripped, "value": stripped}
-        return None
+        parsed = _parse_fact_statement_impl(prompt)
+        if parsed is None:
+            return None
+        subject, value = parsed
+        return {"subject": subject, "value": value}
 
     def _parse_preference_statement(self, prompt: str) -> Optional[Dict[str, str]]:
         """Extract preference data from the prompt when possible."""
 
-        lowered = prompt.lower()
-        if "mon avis" in lowered:
-            after = self._extract_after_keyword(prompt, "mon avis").strip(" :")
-            if after:
-                return {"category": "general", "item": after, "opinion": after}
+        parsed = _parse_preference_statement_impl(prompt)
+        if parsed is None:
             return None
-        like_match = re.search(r"j'aime\s+(.+)", prompt, flags=re.IGNORECASE)
-        if like_match:
-            item = like_match.group(1).strip(" .")
-            return {"category": "likes", "item": item, "opinion": "like"}
-        dislike_match = re.search(r"je n'aime pas\s+(.+)", prompt, flags=re.IGNORECASE)
-        if dislike_match:
-            item = dislike_match.group(1).strip(" .")
-            return {"category": "dislikes", "item": item, "opinion": "dislike"}
-        return None
+        category, item, opinion = parsed
+        return {"category": category, "item": item, "opinion": opinion}
 
     def _extract_question_subject(self, prompt: str) -> Optional[str]:
         """Extract the subject of a question to query the knowledge base."""
 
-        lowered = prompt.lower().strip(" ?!.")
-        patterns = [
-            r"qui est\s+(.+)",
-            r"qu'est-ce que\s+(.+)",
-            r"quel est\s+(.+)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, lowered)
-            if match:
-                return match.group(1).strip()
-        if lowered.endswith("?"):
-            lowered = lowered[:-1]
-        return lowered if lowered else None
+        return _extract_question_subject_impl(prompt)
 
     def _find_matching_facts(self, subject_query: str) -> List[Dict[str, Any]]:
         """Return facts whose subject roughly matches the query."""
 
-        matches: List[Dict[str, Any]] = []
-        subject_query_lower = subject_query.lower()
-        for fact in self.memory.get("facts", {}).get("items", []):
-            if fact.get("deleted"):
-                continue
-            subject = fact.get("subject", "")
-            value = fact.get("value", "")
-            if subject_query_lower in subject.lower() or subject.lower() in subject_query_lower:
-                matches.append(fact)
-            elif subject_query_lower in value.lower():
-                matches.append(fact)
-        return matches
+        query = subject_query.lower()
+        cols = self._facts_cols
+        subjects, values, deleted = cols["subject_lc"], cols["value_lc"], cols["deleted"]
+        rows = self._candidate_rows(query)
+        if rows is None:
+            rows = range(len(subjects))
+        return [
+            cols["ref"][row]
+            for row in rows
+            if not deleted[row]
+            and (query in subjects[row] or subjects[row] in query or query in values[row])
+        ]
 
     def _extract_after_keyword(self, prompt: str, keyword: str) -> str:
         """Utility returning text located after the first occurrence of keyword."""
 
-        pattern = re.compile(re.escape(keyword), flags=re.IGNORECASE)
-        match = pattern.search(prompt)
-        if not match:
-            return ""
-        return prompt[match.end() :]
-
-    @staticmethod
-    def _now() -> str:
-        return datetime.now(timezone.utc).isoformat()
+        return _extract_after_keyword_impl(prompt, keyword)
+
+    @classmethod
+    def _now(cls) -> str:
+        """Return the current UTC time as an ISO 8601 string.
+
+        The part up to the second is formatted at most once per second; only
+        the microseconds are formatted on every call.
+        """
+
+        second, micros = divmod(time.time_ns() // 1000, 1_000_000)
+        cached_second, prefix = cls._now_cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            cls._now_cache = (second, prefix)
+        return f"{prefix}.{micros:06d}+00:00"
 
 
 __all__ = ["AxonAgent"]